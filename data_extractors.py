@@ -3,10 +3,15 @@ Data Extractors for various data sources
 """
 
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 import sqlite3
+import queue
+import threading
 import requests
 import json
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 
 class BaseExtractor(ABC):
     """Base class for all data extractors"""
@@ -18,35 +23,174 @@ class BaseExtractor(ABC):
 class CSVExtractor(BaseExtractor):
     """Extract data from CSV files"""
 
-    def __init__(self, file_path):
+    # Parse in 16 MiB blocks across the Arrow thread pool
+    BLOCK_SIZE = 16 << 20
+
+    def __init__(self, file_path, schema=None):
         self.file_path = file_path
+        # Optional {column: pyarrow type} overrides; other columns are inferred
+        self.schema = schema or {}
 
     def extract(self):
         """Extract data from CSV file"""
         try:
-            df = pd.read_csv(self.file_path)
+            table = pacsv.read_csv(
+                self.file_path,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=self.BLOCK_SIZE),
+                # Empty strings become nulls, matching pandas.read_csv
+                convert_options=pacsv.ConvertOptions(column_types=self.schema, strings_can_be_null=True)
+            )
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
             return df
         except Exception as e:
             raise Exception(f"Failed to extract from CSV {self.file_path}: {str(e)}")
 
+class SQLiteConnectionPool:
+    """Reusable, tuned SQLite connections for a single database"""
+
+    PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-200000",
+        "PRAGMA mmap_size=268435456"
+    ]
+
+    def __init__(self, database, size=4):
+        self.database = database
+        self.size = size
+        self._idle = queue.Queue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Open a connection and apply the pool PRAGMAs once"""
+        conn = sqlite3.connect(self.database, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, opening one lazily while below pool size"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+
+            if can_open:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                conn = self._idle.get()
+
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+def get_connection_pool(connection_string):
+    """Return the shared connection pool for a database, creating it once"""
+    with _connection_pools_lock:
+        pool = _connection_pools.get(connection_string)
+        if pool is None:
+            pool = SQLiteConnectionPool(connection_string)
+            _connection_pools[connection_string] = pool
+        return pool
+
+def close_connection_pools():
+    """Close and forget every shared connection pool"""
+    with _connection_pools_lock:
+        pools = list(_connection_pools.values())
+        _connection_pools.clear()
+
+    for pool in pools:
+        pool.close()
+
 class DatabaseExtractor(BaseExtractor):
     """Extract data from SQL databases"""
 
-    def __init__(self, connection_string):
+    # Rows fetched per round trip before conversion to Arrow
+    CHUNK_SIZE = 100_000
+
+    # Default query: only transactions the cleaners would keep (positive
+    # amounts, no future dates), so rejected rows never leave the database
+    TRANSACTIONS_QUERY = (
+        "SELECT * FROM transactions "
+        "WHERE amount > 0 AND datetime(transaction_date) <= datetime('now', 'localtime')"
+    )
+
+    # Fixed column types for staged transactions, so every extract writes the
+    # same schema regardless of the types inferred from a given day's rows
+    # (all-NULL products, whole-number amounts, ...)
+    TRANSACTIONS_SCHEMA = pa.schema([
+        ('transaction_id', pa.int64()),
+        ('customer_id', pa.int64()),
+        ('amount', pa.float64()),
+        ('transaction_date', pa.large_string()),
+        ('product', pa.large_string())
+    ])
+
+    def __init__(self, connection_string, chunksize=CHUNK_SIZE):
         self.connection_string = connection_string
-
-    def extract(self, query=None):
-        """Extract data from database"""
+        self.chunksize = chunksize
+
+    def extract(self, query=None, since=None):
+        """Extract data from database
+
+        Without a query, transactions are read with the default filters; pass
+        `since` (a high-watermark transaction_date) to read only rows dated at
+        or after it. The bound is inclusive so rows inserted later with the
+        watermark's own timestamp are still picked up; rows already read come
+        back again and are removed by the transaction_id deduplication. Rows
+        back-dated below the watermark are never extracted.
+        """
         try:
-            conn = sqlite3.connect(self.connection_string)
-
-            if query:
-                df = pd.read_sql_query(query, conn)
-            else:
-                # Default query to get all transactions
-                df = pd.read_sql_query("SELECT * FROM transactions", conn)
-
-            conn.close()
+            params = None
+
+            if not query:
+                query = self.TRANSACTIONS_QUERY
+                if since is not None:
+                    # Normalize both sides, as above, so 'T'-separated and
+                    # space-separated timestamps compare chronologically
+                    query += " AND datetime(transaction_date) >= datetime(?)"
+                    params = (str(since),)
+
+            # Stream the result in fixed-size chunks, keeping each one as a
+            # compact Arrow table instead of object arrays
+            with get_connection_pool(self.connection_string).connection() as conn:
+                tables = [
+                    pa.Table.from_pandas(chunk, preserve_index=False)
+                    for chunk in pd.read_sql_query(query, conn, params=params, chunksize=self.chunksize)
+                ]
+
+            if not tables:
+                return pd.DataFrame()
+
+            # Types are inferred per chunk (e.g. int vs float amounts, or null
+            # for all-NULL columns), so unify them to a common schema
+            table = pa.concat_tables(tables, promote_options='permissive')
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
             return df
 
         except Exception as e:
@@ -0,0 +1,53 @@
+"""
+Data Loaders for various data targets
+"""
+
+import csv
+import io
+from abc import ABC, abstractmethod
+from sqlalchemy import create_engine
+
+class BaseLoader(ABC):
+    """Base class for all data loaders"""
+
+    @abstractmethod
+    def load(self, df, table_name):
+        pass
+
+def _copy_from_csv(table, conn, keys, data_iter):
+    """DataFrame.to_sql method that streams each chunk through PostgreSQL COPY"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+
+    columns = ', '.join(f'"{key}"' for key in keys)
+    target = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {target} ({columns}) FROM STDIN WITH (FORMAT CSV)", buffer)
+
+class DatabaseLoader(BaseLoader):
+    """Load data into SQL databases"""
+
+    # Rows sent to the database per batch
+    CHUNK_SIZE = 10_000
+
+    def __init__(self, connection_string):
+        self.connection_string = connection_string
+        self.engine = create_engine(connection_string)
+
+    def load(self, df, table_name, if_exists='append', chunksize=CHUNK_SIZE):
+        """Load data to target database"""
+        try:
+            # PostgreSQL gets COPY; other dialects use one prepared INSERT
+            # executed per batch
+            method = _copy_from_csv if self.engine.dialect.name == 'postgresql' else None
+
+            # Single transaction so the commit (and fsync) happens once
+            with self.engine.begin() as conn:
+                df.to_sql(table_name, conn, if_exists=if_exists, index=False, chunksize=chunksize, method=method)
+
+            return len(df)
+
+        except Exception as e:
+            raise Exception(f"Failed to load into {table_name}: {str(e)}")
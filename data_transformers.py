@@ -4,26 +4,82 @@ Data Transformation and Cleaning Classes
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import duckdb
 from datetime import datetime
 import re
 
+# RE2-compatible (no lookarounds), so Arrow can evaluate it natively
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+# Built once at import instead of on every validation call
+_EMAIL_MATCH_OPTIONS = pc.MatchSubstringOptions(EMAIL_PATTERN)
+
+def _clean_strings(series, *kernels):
+    """Run PyArrow string kernels over a column and return an Arrow-backed array"""
+    arr = pa.array(series, type=pa.large_string(), from_pandas=True)
+    for kernel in kernels:
+        arr = kernel(arr)
+    return pd.array(arr, dtype=pd.ArrowDtype(pa.large_string()))
+
+def _first_occurrences(series):
+    """Positions of the first row for each distinct key, in original order"""
+    # Single hash pass over the key column only (nulls form one group,
+    # as with drop_duplicates)
+    keys = pa.table({
+        'key': pa.array(series, from_pandas=True),
+        'row': np.arange(len(series))
+    })
+    first = keys.group_by('key').aggregate([('row', 'min')])['row_min']
+    return np.sort(first.to_numpy())
+
+def _to_mask(condition):
+    """NumPy boolean mask from a (possibly nullable) condition; nulls are False"""
+    return condition.to_numpy(dtype=bool, na_value=False)
+
+def _parse_dates(series):
+    """Parse a date column unless it already arrives typed (e.g. from Arrow)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    try:
+        # Vectorized ISO-8601 parse (date-only and date-time strings)
+        arr = pa.array(series, type=pa.large_string(), from_pandas=True)
+        parsed = pd.array(arr.cast(pa.timestamp('ns')), dtype=pd.ArrowDtype(pa.timestamp('ns')))
+        return pd.Series(parsed, index=series.index, name=series.name)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Offsets, datetime objects, etc.: explicit format avoids dateutil.
+        # Offset-qualified values are converted to UTC and made naive, and
+        # the result gets the same Arrow timestamp type as the fast path, so
+        # the dtype never depends on which values a column contains
+        parsed = pd.to_datetime(series, format='ISO8601', utc=True, cache=True).dt.tz_convert(None)
+        return parsed.astype(pd.ArrowDtype(pa.timestamp('ns')))
+
+def _valid_email_mask(emails):
+    """Vectorized RE2 email check; null emails never match"""
+    arr = pa.array(emails, type=pa.large_string(), from_pandas=True)
+    matches = pc.fill_null(pc.match_substring_regex(arr, options=_EMAIL_MATCH_OPTIONS), False)
+    return matches.to_numpy(zero_copy_only=False)
+
+def _valid_age_mask(ages):
+    """Reasonable age range"""
+    return _to_mask((ages >= 18) & (ages <= 120))
+
 class DataCleaner:
     """Data cleaning operations"""
 
     def clean_customer_data(self, df):
         """Clean customer data"""
-        df_clean = df.copy()
-
-        # Remove duplicates
-        df_clean = df_clean.drop_duplicates(subset=['customer_id'])
+        # Remove duplicates (take returns a new frame, so the input is untouched)
+        df_clean = df.take(_first_occurrences(df['customer_id']))
 
         # Clean string fields
-        df_clean['first_name'] = df_clean['first_name'].str.strip().str.title()
-        df_clean['last_name'] = df_clean['last_name'].str.strip().str.title()
-        df_clean['city'] = df_clean['city'].str.strip().str.title()
+        for column in ['first_name', 'last_name', 'city']:
+            df_clean[column] = _clean_strings(df_clean[column], pc.utf8_trim_whitespace, pc.utf8_title)
 
         # Clean email addresses
-        df_clean['email'] = df_clean['email'].str.strip().str.lower()
+        df_clean['email'] = _clean_strings(df_clean['email'], pc.utf8_trim_whitespace, pc.utf8_lower)
 
         # Handle missing values
         df_clean = df_clean.dropna(subset=['customer_id', 'email'])
@@ -32,57 +88,206 @@ class DataCleaner:
 
     def clean_transaction_data(self, df):
         """Clean transaction data"""
-        df_clean = df.copy()
-
-        # Convert transaction_date to datetime
-        df_clean['transaction_date'] = pd.to_datetime(df_clean['transaction_date'])
+        # Remove transactions with invalid amounts first: filtering already
+        # returns new data, so a shallow copy detaches it from the input
+        # without the up-front deep copy
+        df_clean = df[df['amount'] > 0].copy(deep=False)
 
-        # Remove transactions with invalid amounts
-        df_clean = df_clean[df_clean['amount'] > 0]
+        # Convert transaction_date to datetime (Arrow-typed sources arrive parsed)
+        df_clean['transaction_date'] = _parse_dates(df_clean['transaction_date'])
 
         # Clean product names
-        df_clean['product'] = df_clean['product'].str.strip().str.title()
+        df_clean['product'] = _clean_strings(df_clean['product'], pc.utf8_trim_whitespace, pc.utf8_title)
 
         # Remove duplicates
-        df_clean = df_clean.drop_duplicates(subset=['transaction_id'])
+        df_clean = df_clean.take(_first_occurrences(df_clean['transaction_id']))
 
         # Handle missing values
         df_clean = df_clean.dropna(subset=['transaction_id', 'customer_id', 'amount'])
 
         return df_clean
 
+    def clean_and_validate_customer_data(self, df):
+        """Clean and validate customer data with a single row filter
+
+        Equivalent to DataValidator().validate_customers(clean_customer_data(df)),
+        but all predicates are combined into one mask so the frame is
+        materialized once and names are only cleaned for surviving rows.
+        """
+        emails = _clean_strings(df['email'], pc.utf8_trim_whitespace, pc.utf8_lower)
+
+        # First row per customer_id, then missing-value and validation rules
+        keep = np.zeros(len(df), dtype=bool)
+        keep[_first_occurrences(df['customer_id'])] = True
+        keep &= _to_mask(df['customer_id'].notna())
+        keep &= _valid_email_mask(emails)
+        keep &= _valid_age_mask(df['age'])
+
+        rows = np.flatnonzero(keep)
+        df_clean = df.take(rows)
+        df_clean['email'] = emails[rows]
+
+        for column in ['first_name', 'last_name', 'city']:
+            df_clean[column] = _clean_strings(df_clean[column], pc.utf8_trim_whitespace, pc.utf8_title)
+
+        return df_clean
+
+    def clean_and_validate_transaction_data(self, df):
+        """Clean and validate transaction data with a single row filter
+
+        Equivalent to DataValidator().validate_transactions(clean_transaction_data(df)),
+        with every predicate evaluated on key columns before one take.
+        """
+        # Duplicates are resolved among positive-amount rows, as in
+        # clean_transaction_data
+        rows = np.flatnonzero(_to_mask(df['amount'] > 0))
+        rows = rows[_first_occurrences(df['transaction_id'].take(rows))]
+
+        dates = _parse_dates(df['transaction_date'].take(rows))
+        keep = _to_mask(df['transaction_id'].take(rows).notna())
+        keep &= _to_mask(df['customer_id'].take(rows).notna())
+        keep &= _to_mask(dates <= datetime.now())
+
+        df_clean = df.take(rows[keep])
+        df_clean['transaction_date'] = dates.array[keep]
+        df_clean['product'] = _clean_strings(df_clean['product'], pc.utf8_trim_whitespace, pc.utf8_title)
+
+        return df_clean
+
+def _arrow_quality_counts(df):
+    """Per-column null counts and duplicate row count via Arrow, or None
+
+    Nulls come straight from the validity bitmaps and duplicates from one
+    hash group-by over all columns. Returns None for data Arrow can't
+    represent or hash (mixed-type object columns, dict/list values, ...).
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        null_counts = [table.column(i).null_count for i in range(table.num_columns)]
+        distinct_records = table.group_by(table.column_names).aggregate([]).num_rows
+    except pa.ArrowException:
+        return None
+
+    return null_counts, len(df) - distinct_records
+
+class DataAggregator:
+    """Data aggregation operations"""
+
+    def aggregate_customer_spend(self, df):
+        """Total, mean and count of transaction amounts per customer
+
+        Matches df.groupby('customer_id')['amount'].agg(['sum', 'mean', 'count']):
+        rows with a null customer_id are dropped and null amounts are skipped.
+        """
+        # Hash the key once into dense codes; only the distinct ids get sorted
+        codes, customer_ids = pd.factorize(df['customer_id'], sort=False)
+        amounts = df['amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+        n_customers = len(customer_ids)
+
+        keyed = codes >= 0
+        present = keyed & ~np.isnan(amounts)
+
+        # bincount returns int64 rather than float64 when no weights are present
+        sums = np.bincount(codes[present], weights=amounts[present], minlength=n_customers).astype(np.float64)
+        counts = np.bincount(codes[present], minlength=n_customers)
+        means = np.divide(sums, counts, out=np.full(n_customers, np.nan), where=counts > 0)
+
+        order = customer_ids.argsort()
+
+        return pd.DataFrame({
+            'customer_id': customer_ids[order],
+            'total_spent': sums[order],
+            'avg_transaction': means[order],
+            'transaction_count': counts[order]
+        })
+
+    def join_and_aggregate(self, customers_df, transactions_df):
+        """Spend summary for customers with more than $500 in transactions
+
+        Matches merging customers with transactions on customer_id, grouping
+        by the six customer columns and taking the sum, mean and count of
+        amount rounded to cents (half-to-even), keeping totals over $500.
+        Amounts are summed as DECIMAL(18,2), so totals are exact and the
+        rounding of ties doesn't depend on float summation order.
+        """
+        con = duckdb.connect()
+
+        try:
+            # Register Arrow views so DuckDB scans the columns without copying
+            con.register('c', pa.Table.from_pandas(customers_df, preserve_index=False))
+            con.register('t', pa.Table.from_pandas(transactions_df, preserve_index=False))
+
+            # Aggregate on the integer customer_id alone, then attach the
+            # customer attributes: the string columns are never hashed as
+            # group keys. Cleaned customers are unique per customer_id, so
+            # this matches grouping the joined rows by all six columns.
+            agg_df = con.execute("""
+                WITH spend AS (
+                    SELECT
+                        customer_id,
+                        SUM(CAST(amount AS DECIMAL(18, 2))) AS total_spent,
+                        COUNT(amount) AS transaction_count
+                    FROM t
+                    GROUP BY customer_id
+                    HAVING SUM(CAST(amount AS DECIMAL(18, 2))) > 500
+                )
+                SELECT
+                    c.customer_id, c.first_name, c.last_name,
+                    c.email, c.age, c.city,
+                    CAST(s.total_spent * 100 AS BIGINT) AS total_cents,
+                    s.transaction_count
+                FROM c
+                JOIN spend s USING (customer_id)
+                ORDER BY c.customer_id
+            """).df()
+        finally:
+            con.close()
+
+        # Mean in whole cents, rounding exact half-cent ties to even
+        cents = agg_df.pop('total_cents').to_numpy(dtype=np.int64)
+        counts = agg_df['transaction_count'].to_numpy(dtype=np.int64)
+        quotient, remainder = np.divmod(cents, counts)
+        round_up = (2 * remainder > counts) | ((2 * remainder == counts) & (quotient % 2 == 1))
+
+        agg_df.insert(6, 'total_spent', cents / 100)
+        agg_df.insert(7, 'avg_transaction', (quotient + round_up) / 100)
+
+        return agg_df
+
 class DataValidator:
     """Data validation operations"""
 
     def validate_customers(self, df):
         """Validate customer data"""
-        # Email validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        df = df[df['email'].str.match(email_pattern)]
-
-        # Age validation (reasonable age range)
-        df = df[(df['age'] >= 18) & (df['age'] <= 120)]
+        # Email validation and age validation (reasonable age range)
+        mask = _valid_email_mask(df['email']) & _valid_age_mask(df['age'])
 
-        return df
+        return df[mask]
 
     def validate_transactions(self, df):
         """Validate transaction data"""
-        # Amount validation (positive amounts only)
-        df = df[df['amount'] > 0]
-
-        # Date validation (not future dates)
+        # Amount validation (positive amounts only) and date validation
+        # (not future dates)
         today = datetime.now()
-        df = df[df['transaction_date'] <= today]
+        mask = _to_mask(df['amount'] > 0) & _to_mask(df['transaction_date'] <= today)
 
-        return df
+        return df[mask]
 
     def generate_data_quality_report(self, df, dataset_name):
         """Generate data quality report"""
+        counts = _arrow_quality_counts(df) if len(df.columns) else None
+
+        if counts is None:
+            null_counts = df.isnull().sum().tolist()
+            duplicate_records = df.duplicated().sum()
+        else:
+            null_counts, duplicate_records = counts
+
         report = {
             'dataset': dataset_name,
             'total_records': len(df),
-            'missing_values': df.isnull().sum().to_dict(),
-            'duplicate_records': df.duplicated().sum(),
+            'missing_values': dict(zip(df.columns, null_counts)),
+            'duplicate_records': duplicate_records,
             'data_types': df.dtypes.to_dict()
         }
 
@@ -4,16 +4,35 @@ Orchestrates the complete Extract, Transform, Load process
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import logging
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.extract.data_extractors import CSVExtractor, DatabaseExtractor
 from src.transform.data_cleaners import DataCleaner
-from src.transform.data_validators import DataValidator
+from src.transform.data_aggregators import DataAggregator
 from src.load.data_loaders import DatabaseLoader
 from src.utils.logger import setup_logger
 from src.utils.config import Config
 
+# Copy lazily, per column and only on write, instead of cloning whole frames
+pd.options.mode.copy_on_write = True
+
+# Explicit Arrow types for the customer CSV so parsing skips type inference
+CUSTOMER_SCHEMA = {
+    'customer_id': pa.int64(),
+    'first_name': pa.large_string(),
+    'last_name': pa.large_string(),
+    'email': pa.large_string(),
+    'age': pa.int64(),
+    'city': pa.large_string()
+}
+
+# Supported targets.backup_format values; the first is the default
+BACKUP_FORMATS = ('parquet', 'csv')
+
 class ETLPipeline:
     def __init__(self, config_path='config/config.yml'):
         """Initialize ETL Pipeline with configuration"""
@@ -33,14 +52,19 @@ class ETLPipeline:
         self.logger.info("Starting data extraction...")
 
         try:
-            # Extract customer data from CSV
-            csv_extractor = CSVExtractor(self.config.get('sources.customer_csv'))
-            customers_df = csv_extractor.extract()
-
-            # Extract transaction data from database
+            csv_extractor = CSVExtractor(self.config.get('sources.customer_csv'), schema=CUSTOMER_SCHEMA)
             db_extractor = DatabaseExtractor(self.config.get('sources.transactions_db'))
-            transactions_df = db_extractor.extract()
 
+            # Extract customers (CSV) and transactions (database) concurrently;
+            # both release the GIL while reading and parsing
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                customers_future = executor.submit(csv_extractor.extract)
+                transactions_future = executor.submit(db_extractor.extract)
+                customers_df = customers_future.result()
+                transactions_df = transactions_future.result()
+
+            # Transactions are filtered in the database (positive amounts, no
+            # future dates), so this counts rows delivered, not source rows
             self.stats['records_extracted'] = len(customers_df) + len(transactions_df)
             self.logger.info(f"Extracted {self.stats['records_extracted']} records")
 
@@ -56,19 +80,16 @@ class ETLPipeline:
         self.logger.info("Starting data transformation...")
 
         try:
-            # Initialize data cleaner and validator
+            # Initialize data cleaner
             cleaner = DataCleaner()
-            validator = DataValidator()
 
-            # Clean customer data
-            customers_clean = cleaner.clean_customer_data(customers_df)
-
-            # Clean transaction data
-            transactions_clean = cleaner.clean_transaction_data(transactions_df)
-
-            # Validate data quality
-            customers_valid = validator.validate_customers(customers_clean)
-            transactions_valid = validator.validate_transactions(transactions_clean)
+            # Clean and validate customers and transactions concurrently, each
+            # in one filtering pass; the Arrow kernels release the GIL
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                customers_future = executor.submit(cleaner.clean_and_validate_customer_data, customers_df)
+                transactions_future = executor.submit(cleaner.clean_and_validate_transaction_data, transactions_df)
+                customers_valid = customers_future.result()
+                transactions_valid = transactions_future.result()
 
             # Join and aggregate data
             final_df = self._join_and_aggregate(customers_valid, transactions_valid)
@@ -88,13 +109,29 @@ class ETLPipeline:
         self.logger.info("Starting data loading...")
 
         try:
+            # Check the backup format before anything is written, so a typo
+            # never produces Parquet bytes under another extension
+            backup_format = self.config.get('targets.backup_format') or BACKUP_FORMATS[0]
+            if backup_format not in BACKUP_FORMATS:
+                raise ValueError(f"Unsupported backup_format {backup_format!r}; expected one of {BACKUP_FORMATS}")
+
             # Load to database
             db_loader = DatabaseLoader(self.config.get('targets.data_warehouse'))
             db_loader.load(data_df, table_name='customer_summary')
 
-            # Load to CSV for backup
-            output_path = f"data/output/customer_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            data_df.to_csv(output_path, index=False)
+            # Write a backup file: Parquet by default, CSV only if configured
+            output_path = f"data/output/customer_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{backup_format}"
+
+            if backup_format == 'csv':
+                data_df.to_csv(output_path, index=False)
+            else:
+                pq.write_table(
+                    pa.Table.from_pandas(data_df, preserve_index=False),
+                    output_path,
+                    compression='snappy',
+                    use_dictionary=True,
+                    row_group_size=256_000
+                )
 
             self.stats['records_loaded'] = len(data_df)
             self.logger.info(f"Loaded {self.stats['records_loaded']} records")
@@ -106,29 +143,7 @@ class ETLPipeline:
 
     def _join_and_aggregate(self, customers_df, transactions_df):
         """Join customer and transaction data and create aggregations"""
-        # Join data on customer_id
-        joined_df = customers_df.merge(
-            transactions_df, 
-            on='customer_id', 
-            how='inner'
-        )
-
-        # Aggregate transaction data per customer
-        agg_df = joined_df.groupby([
-            'customer_id', 'first_name', 'last_name', 
-            'email', 'age', 'city'
-        ]).agg({
-            'amount': ['sum', 'mean', 'count']
-        }).round(2)
-
-        # Flatten column names
-        agg_df.columns = ['total_spent', 'avg_transaction', 'transaction_count']
-        agg_df = agg_df.reset_index()
-
-        # Filter customers with more than $500 total spending
-        agg_df = agg_df[agg_df['total_spent'] > 500]
-
-        return agg_df
+        return DataAggregator().join_and_aggregate(customers_df, transactions_df)
 
     def run(self):
         """Execute the complete ETL pipeline"""
@@ -2,31 +2,47 @@
 Unit tests for data extraction modules
 """
 
+import os
+import sqlite3
+import tempfile
 import unittest
 import pandas as pd
+import pyarrow as pa
 from unittest.mock import patch, MagicMock
-from src.extract.data_extractors import CSVExtractor, DatabaseExtractor, APIExtractor
+from src.extract.data_extractors import CSVExtractor, DatabaseExtractor, APIExtractor, close_connection_pools
 
 class TestDataExtractors(unittest.TestCase):
 
+    def tearDown(self):
+        close_connection_pools()
+
     def test_csv_extractor_success(self):
         """Test successful CSV extraction"""
         # Create sample CSV data
-        sample_data = pd.DataFrame({
+        sample_data = pa.table({
             'id': [1, 2, 3],
             'name': ['Alice', 'Bob', 'Charlie']
         })
 
-        with patch('pandas.read_csv', return_value=sample_data):
+        with patch('pyarrow.csv.read_csv', return_value=sample_data):
             extractor = CSVExtractor('test.csv')
             result = extractor.extract()
 
             self.assertEqual(len(result), 3)
             self.assertListEqual(list(result.columns), ['id', 'name'])
 
+    def test_csv_extractor_schema(self):
+        """Test CSV extraction honours explicit column types"""
+        with patch('pyarrow.csv.read_csv', return_value=pa.table({'id': [1]})) as mock_read:
+            extractor = CSVExtractor('test.csv', schema={'id': pa.int64()})
+            extractor.extract()
+
+            convert_options = mock_read.call_args.kwargs['convert_options']
+            self.assertEqual(convert_options.column_types, {'id': pa.int64()})
+
     def test_csv_extractor_file_not_found(self):
         """Test CSV extraction with file not found"""
-        with patch('pandas.read_csv', side_effect=FileNotFoundError):
+        with patch('pyarrow.csv.read_csv', side_effect=FileNotFoundError):
             extractor = CSVExtractor('nonexistent.csv')
 
             with self.assertRaises(Exception) as context:
@@ -46,14 +62,102 @@ class TestDataExtractors(unittest.TestCase):
             'id': [1, 2, 3],
             'amount': [100, 200, 300]
         })
-        mock_read_sql.return_value = sample_data
+        mock_read_sql.return_value = iter([sample_data])
 
         extractor = DatabaseExtractor('test.db')
         result = extractor.extract()
 
         self.assertEqual(len(result), 3)
-        mock_connect.assert_called_once_with('test.db')
-        mock_conn.close.assert_called_once()
+        mock_connect.assert_called_once_with('test.db', check_same_thread=False)
+        mock_conn.execute.assert_any_call("PRAGMA journal_mode=WAL")
+        self.assertEqual(mock_read_sql.call_args.kwargs['chunksize'], DatabaseExtractor.CHUNK_SIZE)
+
+    @patch('sqlite3.connect')
+    @patch('pandas.read_sql_query')
+    def test_database_extractor_concatenates_chunks(self, mock_read_sql, mock_connect):
+        """Test chunked results are combined into one frame"""
+        mock_read_sql.return_value = iter([
+            pd.DataFrame({'id': [1, 2], 'product': ['A', 'B']}),
+            pd.DataFrame({'id': [3], 'product': [None]})
+        ])
+
+        extractor = DatabaseExtractor('test.db', chunksize=2)
+        result = extractor.extract()
+
+        self.assertListEqual(result['id'].tolist(), [1, 2, 3])
+        self.assertTrue(pd.isna(result['product'].iloc[2]))
+
+    @patch('sqlite3.connect')
+    @patch('pandas.read_sql_query')
+    def test_database_extractor_since(self, mock_read_sql, mock_connect):
+        """Test incremental extraction filters on the high-watermark"""
+        mock_read_sql.return_value = iter([pd.DataFrame({'id': [1]})])
+
+        extractor = DatabaseExtractor('test.db')
+        extractor.extract(since='2024-01-31')
+
+        query = mock_read_sql.call_args.args[0]
+        self.assertIn("amount > 0", query)
+        self.assertIn("datetime(transaction_date) >= datetime(?)", query)
+        self.assertEqual(mock_read_sql.call_args.kwargs['params'], ('2024-01-31',))
+
+    def test_database_extractor_since_mixed_date_forms(self):
+        """Test the watermark compares chronologically across date formats"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'transactions.db')
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE transactions (transaction_id, amount, transaction_date)")
+            conn.executemany("INSERT INTO transactions VALUES (?, ?, ?)", [
+                (1, 10.0, '2024-01-05T09:00:00'),
+                (2, 20.0, '2024-01-05 23:00:00'),
+                (3, 30.0, '2024-01-05T23:30:00')
+            ])
+            conn.commit()
+            conn.close()
+
+            result = DatabaseExtractor(db_path).extract(since='2024-01-05T09:00:00')
+            close_connection_pools()
+
+        self.assertListEqual(result['transaction_id'].tolist(), [1, 2, 3])
+
+    def test_database_extractor_since_same_timestamp_row(self):
+        """Test a row inserted later at the watermark's timestamp is extracted"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'transactions.db')
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE transactions (transaction_id, amount, transaction_date)")
+            conn.executemany("INSERT INTO transactions VALUES (?, ?, ?)", [
+                (1, 10.0, '2024-01-05'),
+                (2, 20.0, '2024-01-05')
+            ])
+            conn.commit()
+
+            extractor = DatabaseExtractor(db_path)
+            first = extractor.extract()
+            watermark = pd.to_datetime(first['transaction_date'], format='ISO8601').max()
+
+            conn.execute("INSERT INTO transactions VALUES (3, 30.0, '2024-01-05')")
+            conn.commit()
+            conn.close()
+
+            second = extractor.extract(since=watermark.strftime('%Y-%m-%d %H:%M:%S'))
+            close_connection_pools()
+
+        self.assertListEqual(first['transaction_id'].tolist(), [1, 2])
+        self.assertIn(3, second['transaction_id'].tolist())
+
+    @patch('sqlite3.connect')
+    @patch('pandas.read_sql_query')
+    def test_database_extractor_reuses_connection(self, mock_read_sql, mock_connect):
+        """Test repeated extraction reuses the pooled connection"""
+        mock_read_sql.side_effect = lambda *args, **kwargs: iter([pd.DataFrame({'id': [1]})])
+
+        extractor = DatabaseExtractor('test.db')
+        extractor.extract()
+        extractor.extract()
+
+        mock_connect.assert_called_once()
+        mock_connect.return_value.close.assert_not_called()
 
     @patch('requests.get')
     def test_api_extractor_success(self, mock_get):
@@ -0,0 +1,38 @@
+"""
+Unit tests for data loading modules
+"""
+
+import unittest
+import pandas as pd
+from unittest.mock import patch
+from src.load.data_loaders import DatabaseLoader
+
+class TestDataLoaders(unittest.TestCase):
+
+    def test_database_loader_success(self):
+        """Test loading a DataFrame in batches"""
+        loader = DatabaseLoader('sqlite://')
+        df = pd.DataFrame({
+            'customer_id': [1, 2, 3],
+            'total_spent': [600.0, 750.5, 1200.0]
+        })
+
+        loaded = loader.load(df, table_name='customer_summary', chunksize=2)
+
+        result = pd.read_sql_query("SELECT * FROM customer_summary", loader.engine)
+        self.assertEqual(loaded, 3)
+        self.assertListEqual(list(result.columns), ['customer_id', 'total_spent'])
+        self.assertListEqual(result['customer_id'].tolist(), [1, 2, 3])
+
+    def test_database_loader_failure(self):
+        """Test loading errors are wrapped"""
+        loader = DatabaseLoader('sqlite://')
+
+        with patch('pandas.DataFrame.to_sql', side_effect=ValueError("boom")):
+            with self.assertRaises(Exception) as context:
+                loader.load(pd.DataFrame({'id': [1]}), table_name='customer_summary')
+
+        self.assertIn("Failed to load into customer_summary", str(context.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+"""
+Unit tests for data transformation modules
+"""
+
+import unittest
+from decimal import Decimal, ROUND_HALF_EVEN
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from src.transform.data_cleaners import DataCleaner
+from src.transform.data_validators import DataValidator
+from src.transform.data_aggregators import DataAggregator
+
+def sample_customers():
+    """Customers with duplicates, null keys, bad emails and out-of-range ages"""
+    return pd.DataFrame({
+        'customer_id': [1, 1, 2, 3, np.nan, 4, 5, 6, 7],
+        'first_name': [' alice ', 'dup', 'bob smith', 'carol', 'nokey', 'dan', None, 'eve', 'frank'],
+        'last_name': ['jones', 'x', 'SMITH', 'white', 'y', 'brown', 'green', 'black', 'stone'],
+        'email': [' Alice@Example.COM ', 'dup@example.com', 'bob@example.com', 'not-an-email',
+                  'nokey@example.com', 'dan@example.com', 'g@example.org', None, 'frank@example.io'],
+        'age': [30, 40, 17, 50, 60, 121, 45, 33, np.nan],
+        'city': [' new york', 'a', 'boston ', 'c', 'd', 'e', 'denver', 'f', 'g']
+    })
+
+def sample_transactions():
+    """Transactions with duplicates, null keys, non-positive amounts and future dates"""
+    return pd.DataFrame({
+        'transaction_id': [1, 1, 2, 3, 4, 5, 6, 7, np.nan, 8, 8],
+        'customer_id': [1, 1, 1, 2, 2, np.nan, 3, 3, 3, 4, 4],
+        'amount': [400.0, 999.0, 200.0, -5.0, 0.0, 50.0, 600.0, 75.0, 10.0, -1.0, 30.0],
+        'transaction_date': ['2024-01-01', '2024-01-01', '2024-01-02 10:30:00', '2024-01-03',
+                             '2024-01-04', '2024-01-05', '2200-01-01', '2024-02-01T08:00:00',
+                             '2024-02-02', '2024-02-03', '2024-02-04'],
+        'product': [' widget a', 'dup', 'gadget ', 'x', 'y', 'z', 'future', 'thing b', 'nokey', 'neg', 'late dup']
+    })
+
+def to_arrow_backed(df):
+    """Convert a frame to ArrowDtype columns, as the extractors return them"""
+    return pa.Table.from_pandas(df, preserve_index=False).to_pandas(types_mapper=pd.ArrowDtype)
+
+class TestDataTransformers(unittest.TestCase):
+
+    def setUp(self):
+        self.cleaner = DataCleaner()
+        self.validator = DataValidator()
+
+    def test_clean_customer_data(self):
+        """Test customer deduplication and string normalization"""
+        result = self.cleaner.clean_customer_data(sample_customers())
+
+        first = result.iloc[0]
+        self.assertEqual(result['customer_id'].tolist(), [1, 2, 3, 4, 5, 7])
+        self.assertEqual(first['first_name'], 'Alice')
+        self.assertEqual(first['email'], 'alice@example.com')
+        self.assertEqual(first['city'], 'New York')
+
+    def test_validate_customers(self):
+        """Test email and age rules"""
+        result = self.validator.validate_customers(self.cleaner.clean_customer_data(sample_customers()))
+
+        self.assertEqual(result['customer_id'].tolist(), [1, 5])
+
+    def test_clean_transaction_data(self):
+        """Test amount filter, keep-first deduplication and date parsing"""
+        result = self.cleaner.clean_transaction_data(sample_transactions())
+
+        self.assertEqual(result['transaction_id'].tolist(), [1, 2, 6, 7, 8])
+        self.assertEqual(result['amount'].tolist(), [400.0, 200.0, 600.0, 75.0, 30.0])
+        self.assertEqual(result['product'].iloc[0], 'Widget A')
+        self.assertEqual(result['transaction_date'].iloc[1], pd.Timestamp('2024-01-02 10:30:00'))
+        self.assertEqual(result['transaction_date'].iloc[3], pd.Timestamp('2024-02-01 08:00:00'))
+
+    def test_clean_transaction_data_date_fallback(self):
+        """Test dates Arrow can't cast get the same dtype as ISO strings"""
+        expected_dtype = self.cleaner.clean_transaction_data(sample_transactions())['transaction_date'].dtype
+        self.assertEqual(expected_dtype, pd.ArrowDtype(pa.timestamp('ns')))
+
+        for dates in (['2024/01/05', '2024/01/06 10:30:00'],
+                      ['2024-01-05', '2024-01-06T10:30:00Z'],
+                      ['2024-01-05', '2024-01-06T12:30:00+02:00']):
+            df = pd.DataFrame({
+                'transaction_id': [1, 2],
+                'customer_id': [1, 1],
+                'amount': [10.0, 20.0],
+                'transaction_date': dates,
+                'product': ['a', 'b']
+            })
+
+            result = self.cleaner.clean_transaction_data(df)
+
+            self.assertEqual(result['transaction_date'].dtype, expected_dtype)
+            self.assertListEqual(result['transaction_date'].tolist(),
+                                 [pd.Timestamp('2024-01-05'), pd.Timestamp('2024-01-06 10:30:00')])
+            pd.testing.assert_frame_equal(
+                self.cleaner.clean_and_validate_transaction_data(df),
+                self.validator.validate_transactions(result)
+            )
+
+    def test_fused_customers_match_clean_then_validate(self):
+        """Test the single-pass customer method matches clean then validate"""
+        customers = sample_customers()
+        original = customers.copy()
+
+        expected = self.validator.validate_customers(self.cleaner.clean_customer_data(customers))
+        result = self.cleaner.clean_and_validate_customer_data(customers)
+
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(customers, original)
+
+    def test_fused_transactions_match_clean_then_validate(self):
+        """Test the single-pass transaction method matches clean then validate"""
+        transactions = sample_transactions()
+        original = transactions.copy()
+
+        expected = self.validator.validate_transactions(self.cleaner.clean_transaction_data(transactions))
+        result = self.cleaner.clean_and_validate_transaction_data(transactions)
+
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(transactions, original)
+        self.assertEqual(result['transaction_id'].tolist(), [1, 2, 7, 8])
+
+    def test_fused_matches_clean_then_validate_on_arrow_input(self):
+        """Test the single-pass methods on Arrow-backed frames"""
+        customers = to_arrow_backed(sample_customers())
+        transactions = to_arrow_backed(sample_transactions())
+
+        pd.testing.assert_frame_equal(
+            self.cleaner.clean_and_validate_customer_data(customers),
+            self.validator.validate_customers(self.cleaner.clean_customer_data(customers))
+        )
+        pd.testing.assert_frame_equal(
+            self.cleaner.clean_and_validate_transaction_data(transactions),
+            self.validator.validate_transactions(self.cleaner.clean_transaction_data(transactions))
+        )
+
+class TestDataQualityReport(unittest.TestCase):
+
+    def assert_matches_pandas(self, df):
+        """Compare with the pandas isnull/duplicated counts"""
+        report = DataValidator().generate_data_quality_report(df, 'test')
+
+        self.assertEqual(report['total_records'], len(df))
+        self.assertEqual(report['missing_values'], df.isnull().sum().to_dict())
+        self.assertEqual(report['duplicate_records'], df.duplicated().sum())
+
+    def test_report_counts(self):
+        """Test null and duplicate counts on typed columns"""
+        self.assert_matches_pandas(pd.DataFrame({
+            'id': [1, 1, np.nan, np.nan, 2],
+            'name': ['x', 'x', None, None, 'y'],
+            'seen': pd.to_datetime(['2024-01-01'] * 4 + [None])
+        }))
+
+    def test_report_integer_column_labels(self):
+        """Test missing values stay keyed by the original labels"""
+        df = pd.DataFrame({0: [1, None], 1: ['a', 'b']})
+
+        report = DataValidator().generate_data_quality_report(df, 'test')
+
+        self.assertEqual(report['missing_values'], {0: 1, 1: 0})
+
+    def test_report_dirty_columns(self):
+        """Test mixed-type and dict-valued columns fall back to pandas"""
+        self.assert_matches_pandas(pd.DataFrame({'a': [1, 'x', 1], 'b': [None, 2, None]}))
+        self.assert_matches_pandas(pd.DataFrame({'a': [{'k': 1}, {'k': 1}, {'k': 2}]}))
+
+    def test_report_no_columns(self):
+        """Test a frame without columns reports no duplicates"""
+        report = DataValidator().generate_data_quality_report(pd.DataFrame(index=[0, 1]), 'test')
+
+        self.assertEqual(report['missing_values'], {})
+        self.assertEqual(report['duplicate_records'], 0)
+
+def baseline_join_and_aggregate(customers_df, transactions_df):
+    """The original merge + groupby implementation of the spend summary"""
+    joined_df = customers_df.merge(transactions_df, on='customer_id', how='inner')
+    agg_df = joined_df.groupby([
+        'customer_id', 'first_name', 'last_name',
+        'email', 'age', 'city'
+    ]).agg({
+        'amount': ['sum', 'mean', 'count']
+    }).round(2)
+    agg_df.columns = ['total_spent', 'avg_transaction', 'transaction_count']
+    agg_df = agg_df.reset_index()
+
+    return agg_df[agg_df['total_spent'] > 500].reset_index(drop=True)
+
+def half_even_cents(amounts, divisor=1):
+    """Exact half-to-even rounding of sum(amounts) / divisor to cents"""
+    total = sum(Decimal(f'{amount:.2f}') for amount in amounts) / divisor
+    return float(total.quantize(Decimal('0.01'), rounding=ROUND_HALF_EVEN))
+
+class TestDataAggregator(unittest.TestCase):
+
+    def assert_matches_groupby(self, df):
+        """Compare with pandas groupby sum/mean/count per customer"""
+        expected = df.groupby('customer_id')['amount'].agg(['sum', 'mean', 'count']).reset_index()
+        result = DataAggregator().aggregate_customer_spend(df)
+
+        self.assertListEqual(list(result.columns),
+                             ['customer_id', 'total_spent', 'avg_transaction', 'transaction_count'])
+        np.testing.assert_array_equal(np.asarray(result['customer_id'], dtype=float),
+                                      np.asarray(expected['customer_id'], dtype=float))
+        np.testing.assert_allclose(result['total_spent'], expected['sum'])
+        np.testing.assert_allclose(result['avg_transaction'], expected['mean'])
+        np.testing.assert_array_equal(result['transaction_count'], expected['count'])
+
+    def test_matches_groupby(self):
+        """Test unsorted ids, null ids and null amounts"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'customer_id': rng.integers(0, 50, 1000) * 7,
+            'amount': rng.random(1000) * 100
+        })
+        df.loc[::97, 'customer_id'] = np.nan
+        df.loc[::89, 'amount'] = np.nan
+
+        self.assert_matches_groupby(df)
+
+    def test_matches_groupby_on_arrow_input(self):
+        """Test Arrow-backed input"""
+        self.assert_matches_groupby(to_arrow_backed(pd.DataFrame({
+            'customer_id': [3, 1, 3, 2, 1],
+            'amount': [10.0, 20.0, 30.0, 5.5, 1.0]
+        })))
+
+    def test_empty_input(self):
+        """Test an empty frame yields an empty summary"""
+        df = pd.DataFrame({'customer_id': pd.Series([], dtype='int64'), 'amount': pd.Series([], dtype=float)})
+
+        self.assert_matches_groupby(df)
+        result = DataAggregator().aggregate_customer_spend(df)
+        self.assertEqual(len(result), 0)
+        self.assertEqual(result['total_spent'].dtype, np.float64)
+        self.assertEqual(result['avg_transaction'].dtype, np.float64)
+        self.assertEqual(result['transaction_count'].dtype, np.int64)
+
+    def test_all_null_amounts(self):
+        """Test customers with only null amounts get a zero float total"""
+        df = pd.DataFrame({'customer_id': [1, 2, 1], 'amount': [np.nan, np.nan, np.nan]})
+
+        self.assert_matches_groupby(df)
+        result = DataAggregator().aggregate_customer_spend(df)
+        self.assertEqual(result['total_spent'].dtype, np.float64)
+        self.assertListEqual(result['total_spent'].tolist(), [0.0, 0.0])
+
+class TestJoinAndAggregate(unittest.TestCase):
+
+    def random_dataset(self, seed):
+        """Customers and two-decimal transaction amounts with many half-cent ties"""
+        rng = np.random.default_rng(seed)
+        customers = pd.DataFrame({
+            'customer_id': np.arange(1, 201),
+            'first_name': [f'first{i}' for i in range(200)],
+            'last_name': [f'last{i}' for i in range(200)],
+            'email': [f'user{i}@example.com' for i in range(200)],
+            'age': rng.integers(18, 90, 200),
+            'city': rng.choice(['Boston', 'Denver', 'Austin'], 200)
+        })
+        transactions = pd.DataFrame({
+            'transaction_id': np.arange(2000),
+            'customer_id': rng.integers(1, 231, 2000),
+            'amount': rng.integers(1, 40_000, 2000) / 100
+        })
+        return customers, transactions
+
+    def test_matches_baseline(self):
+        """Test rows, columns and counts match merge + groupby, values to the cent"""
+        customers, transactions = self.random_dataset(0)
+
+        expected = baseline_join_and_aggregate(customers, transactions)
+        result = DataAggregator().join_and_aggregate(customers, transactions)
+
+        self.assertListEqual(list(result.columns), list(expected.columns))
+        pd.testing.assert_frame_equal(result.drop(columns=['total_spent', 'avg_transaction']),
+                                      expected.drop(columns=['total_spent', 'avg_transaction']),
+                                      check_dtype=False)
+        for column in ['total_spent', 'avg_transaction']:
+            np.testing.assert_allclose(result[column], expected[column], rtol=0, atol=0.01 + 1e-9)
+
+    def test_rounding_is_exact_half_even(self):
+        """Test totals and means equal the exact half-to-even cent values"""
+        for seed in range(5):
+            customers, transactions = self.random_dataset(seed)
+            result = DataAggregator().join_and_aggregate(customers, transactions)
+            amounts = transactions.groupby('customer_id')['amount'].apply(list)
+
+            for row in result.itertuples():
+                customer_amounts = amounts[row.customer_id]
+                self.assertEqual(row.total_spent, half_even_cents(customer_amounts))
+                self.assertEqual(row.avg_transaction, half_even_cents(customer_amounts, len(customer_amounts)))
+
+    def test_half_cent_mean_ties(self):
+        """Test half-cent means round to the even cent"""
+        customers = sample_customers().dropna(subset=['customer_id']).drop_duplicates('customer_id')
+        transactions = pd.DataFrame({
+            'transaction_id': [1, 2, 3, 4],
+            'customer_id': [1, 1, 2, 2],
+            'amount': [300.00, 300.01, 300.01, 300.02]
+        })
+
+        result = DataAggregator().join_and_aggregate(customers, transactions)
+
+        self.assertListEqual(result['total_spent'].tolist(), [600.01, 600.03])
+        self.assertListEqual(result['avg_transaction'].tolist(), [300.0, 300.02])
+        self.assertListEqual(result['transaction_count'].tolist(), [2, 2])
+
+if __name__ == '__main__':
+    unittest.main()